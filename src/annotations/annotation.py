@@ -2,8 +2,36 @@
 Data structure for a single annotation.
 """
 import dataclasses
+import numpy as np
 
-@dataclasses.dataclass
+def yolo_to_xyxy(boxes: np.ndarray) -> np.ndarray:
+    """
+    Converts an (N, 4) array from YOLO format (x_center, y_center, width, height)
+    to x1, y1, x2, y2 format.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    out = np.empty_like(boxes)
+    # Half sizes go into the x2/y2 columns first, then both corners are
+    # written in place so no temporaries are allocated.
+    np.multiply(boxes[:, 2:4], 0.5, out=out[:, 2:4])
+    np.subtract(boxes[:, 0:2], out[:, 2:4], out=out[:, 0:2])
+    np.add(boxes[:, 0:2], out[:, 2:4], out=out[:, 2:4])
+    return out
+
+def xyxy_to_yolo(boxes: np.ndarray) -> np.ndarray:
+    """
+    Converts an (N, 4) array from x1, y1, x2, y2 format to YOLO format
+    (x_center, y_center, width, height).
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    out = np.empty_like(boxes)
+    # centers = (p1 + p2) * 0.5, sizes = p2 - p1, computed into out directly
+    np.add(boxes[:, 0:2], boxes[:, 2:4], out=out[:, 0:2])
+    out[:, 0:2] *= 0.5
+    np.subtract(boxes[:, 2:4], boxes[:, 0:2], out=out[:, 2:4])
+    return out
+
+@dataclasses.dataclass(slots=True)
 class Annotation:
     """
     Represents a single annotation with bounding box coordinates in x1, y1, x2, y2 format.
@@ -44,3 +72,68 @@ class Annotation:
         Returns the bounding box coordinates in x1, y1, x2, y2 format.
         """
         return [self.x1, self.y1, self.x2, self.y2]
+
+
+class AnnotationBatch:
+    """
+    Structure-of-arrays container for many annotations of one image.
+    Stores ids, image ids and class ids as integer arrays and the boxes as an
+    (N, 4) float array in x1, y1, x2, y2 format, so bulk operations run as
+    vectorized NumPy expressions instead of per-object Python code.
+    """
+    def __init__(self, ids, image_ids, class_ids, xyxy):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.image_ids = np.asarray(image_ids, dtype=np.int64)
+        self.class_ids = np.asarray(class_ids, dtype=np.int32)
+        self.xyxy = np.asarray(xyxy, dtype=np.float64).reshape(-1, 4)
+
+    @classmethod
+    def from_annotations(cls, annotations):
+        """
+        Creates a batch from a sequence of Annotation objects.
+        """
+        return cls(
+            ids=[a.id for a in annotations],
+            image_ids=[a.image_id for a in annotations],
+            class_ids=[a.class_id for a in annotations],
+            xyxy=[(a.x1, a.y1, a.x2, a.y2) for a in annotations],
+        )
+
+    @classmethod
+    def from_yolo_batch(cls, ids, image_ids, class_ids, yolo):
+        """
+        Creates a batch from an (N, 4) array in YOLO format (x_center, y_center, width, height).
+        """
+        return cls(ids, image_ids, class_ids, yolo_to_xyxy(yolo))
+
+    def to_yolo_batch(self) -> np.ndarray:
+        """
+        Returns all boxes as an (N, 4) array in YOLO format (x_center, y_center, width, height).
+        """
+        return xyxy_to_yolo(self.xyxy)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index) -> Annotation:
+        """
+        Returns the annotation at the given index as a scalar Annotation.
+        """
+        x1, y1, x2, y2 = self.xyxy[index].tolist()
+        return Annotation(
+            id=int(self.ids[index]),
+            image_id=int(self.image_ids[index]),
+            class_id=int(self.class_ids[index]),
+            x1=x1, y1=y1, x2=x2, y2=y2
+        )
+
+    def to_annotations(self) -> list[Annotation]:
+        """
+        Converts the batch into a list of Annotation objects.
+        """
+        return [
+            Annotation(id=i, image_id=img, class_id=c, x1=x1, y1=y1, x2=x2, y2=y2)
+            for i, img, c, (x1, y1, x2, y2) in zip(
+                self.ids.tolist(), self.image_ids.tolist(), self.class_ids.tolist(), self.xyxy.tolist()
+            )
+        ]
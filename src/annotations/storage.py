@@ -3,10 +3,51 @@ Saving and loading annotations (using SQLite).
 """
 import sqlite3
 import logging
-from .annotation import Annotation
+from contextlib import contextmanager
+from .annotation import Annotation, AnnotationBatch
 
 logger = logging.getLogger(__name__)
 
+# SQL for the hot paths. sqlite3 keeps a per-connection LRU of compiled
+# statements keyed by SQL text, so reusing these exact strings lets repeated
+# calls skip parsing and planning.
+_SELECT_IMAGE_ID = "SELECT id FROM images WHERE path = ?"
+_INSERT_IMAGE = "INSERT INTO images (path) VALUES (?)"
+_INSERT_ANNOTATION = "INSERT INTO annotations (image_id, class_id, x1, y1, x2, y2) VALUES (?, ?, ?, ?, ?, ?)"
+_SELECT_ANNOTATIONS = "SELECT id, class_id, x1, y1, x2, y2 FROM annotations WHERE image_id = ?"
+_UPDATE_ANNOTATION = "UPDATE annotations SET class_id = ?, x1 = ?, y1 = ?, x2 = ?, y2 = ? WHERE id = ?"
+_DELETE_ANNOTATION = "DELETE FROM annotations WHERE id = ?"
+# Followed by one "?" placeholder per path
+_SELECT_ANNOTATIONS_FOR_PATHS = (
+    "SELECT images.path, annotations.id, annotations.image_id, annotations.class_id,"
+    " annotations.x1, annotations.y1, annotations.x2, annotations.y2"
+    " FROM annotations JOIN images ON annotations.image_id = images.id"
+    " WHERE images.path IN ({}) ORDER BY annotations.id"
+)
+
+# Paths bound per query in get_annotations_for_paths, well below SQLite's
+# host parameter limit.
+_PATHS_PER_QUERY = 500
+
+# Stored in PRAGMA user_version so future schema changes can detect and
+# migrate older databases.
+_SCHEMA_VERSION = 1
+
+# Size of the per-connection compiled statement cache.
+_STATEMENT_CACHE_SIZE = 64
+
+class _Connection(sqlite3.Connection):
+    """
+    sqlite3 connection that also caches image path -> image ID lookups.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.image_id_cache = {}
+
+def _image_id_cache(conn):
+    # Connections not opened through create_connection have no cache
+    return getattr(conn, "image_id_cache", None)
+
 def create_connection(db_file):
     """ create a database connection to the SQLite database
         specified by db_file
@@ -15,26 +56,48 @@ def create_connection(db_file):
     """
     conn = None
     try:
-        conn = sqlite3.connect(db_file)
-        logger.info(f"Successfully connected to database: {db_file}")
+        # Autocommit mode: single statements commit on their own, and
+        # multi-statement writes open an explicit transaction via _transaction().
+        conn = sqlite3.connect(
+            db_file, isolation_level=None, cached_statements=_STATEMENT_CACHE_SIZE, factory=_Connection
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456") # 256 MB
+        conn.execute("PRAGMA cache_size=-20000") # ~20 MB page cache
+        logger.debug("Successfully connected to database: %s", db_file)
         return conn
     except sqlite3.Error as e:
         logger.error(f"Error connecting to database: {e}")
         return None
 
+@contextmanager
+def _transaction(conn):
+    """
+    Run the enclosed statements in one write transaction, rolling back on error.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
 def create_tables(conn):
     """ create tables in the SQLite database
     :param conn: Connection object
     """
     try:
-        c = conn.cursor()
-        c.execute("""
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS images (
                 id INTEGER PRIMARY KEY,
                 path TEXT NOT NULL UNIQUE
             );
         """)
-        c.execute("""
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS annotations (
                 id INTEGER PRIMARY KEY,
                 image_id INTEGER NOT NULL,
@@ -46,6 +109,9 @@ def create_tables(conn):
                 FOREIGN KEY (image_id) REFERENCES images (id)
             );
         """)
+        # images.path is UNIQUE and therefore already indexed
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_annotations_image_id ON annotations (image_id)")
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         logger.info("Tables created or already exist.")
     except sqlite3.Error as e:
         logger.error(f"Error creating tables: {e}")
@@ -54,18 +120,20 @@ def get_or_create_image(conn, path):
     """
     Get the ID of an image from its path, creating a new record if it doesn't exist.
     """
+    cache = _image_id_cache(conn)
+    if cache is not None and path in cache:
+        return cache[path]
     try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM images WHERE path = ?", (path,))
-        data = cursor.fetchone()
+        data = conn.execute(_SELECT_IMAGE_ID, (path,)).fetchone()
         if data is None:
-            cursor.execute("INSERT INTO images (path) VALUES (?)", (path,))
-            conn.commit()
+            cursor = conn.execute(_INSERT_IMAGE, (path,))
             image_id = cursor.lastrowid
-            logger.info(f"Created new image record for path: {path} with ID: {image_id}")
-            return image_id
+            logger.debug("Created new image record for path: %s with ID: %s", path, image_id)
         else:
-            return data[0]
+            image_id = data[0]
+        if cache is not None:
+            cache[path] = image_id
+        return image_id
     except sqlite3.Error as e:
         logger.error(f"Error getting or creating image for path {path}: {e}")
         return None
@@ -75,55 +143,102 @@ def create_annotation(conn, annotation):
     Create a new annotation.
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO annotations (image_id, class_id, x1, y1, x2, y2) VALUES (?, ?, ?, ?, ?, ?)",
+        cursor = conn.execute(
+            _INSERT_ANNOTATION,
             (annotation.image_id, annotation.class_id, annotation.x1, annotation.y1, annotation.x2, annotation.y2)
         )
-        conn.commit()
         anno_id = cursor.lastrowid
-        logger.info(f"Created new annotation with ID: {anno_id} for image ID: {annotation.image_id}")
+        logger.debug("Created new annotation with ID: %s for image ID: %s", anno_id, annotation.image_id)
         return anno_id
     except sqlite3.Error as e:
         logger.error(f"Error creating annotation for image ID {annotation.image_id}: {e}")
         return None
 
+def create_annotations(conn, annotations):
+    """
+    Create several annotations in a single transaction.
+    Returns the list of new annotation IDs, or None on failure.
+    """
+    try:
+        anno_ids = []
+        with _transaction(conn):
+            for annotation in annotations:
+                cursor = conn.execute(
+                    _INSERT_ANNOTATION,
+                    (annotation.image_id, annotation.class_id, annotation.x1, annotation.y1, annotation.x2, annotation.y2)
+                )
+                anno_ids.append(cursor.lastrowid)
+        logger.info("Created %d annotations in one transaction.", len(anno_ids))
+        return anno_ids
+    except sqlite3.Error as e:
+        logger.error(f"Error creating {len(annotations)} annotations: {e}")
+        return None
+
 def get_annotations_for_image(conn, image_id):
     """
     Get all annotations for a given image ID.
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, class_id, x1, y1, x2, y2 FROM annotations WHERE image_id = ?", (image_id,))
-        annotations = []
-        for row in cursor.fetchall():
-            annotations.append(Annotation(
-                id=row[0],
-                image_id=image_id,
-                class_id=row[1],
-                x1=row[2],
-                y1=row[3],
-                x2=row[4],
-                y2=row[5]
-            ))
-        logger.info(f"Retrieved {len(annotations)} annotations for image ID: {image_id}")
+        # Columns come back as native ints/floats, so rows unpack straight
+        # into Annotation without any per-field conversion.
+        annotations = [
+            Annotation(anno_id, image_id, class_id, x1, y1, x2, y2)
+            for anno_id, class_id, x1, y1, x2, y2 in conn.execute(_SELECT_ANNOTATIONS, (image_id,))
+        ]
+        logger.debug("Retrieved %d annotations for image ID: %s", len(annotations), image_id)
         return annotations
     except sqlite3.Error as e:
         logger.error(f"Error getting annotations for image ID {image_id}: {e}")
         return []
 
+def get_annotations_for_paths(conn, image_paths):
+    """
+    Get the annotations of many images at once, keyed by image path.
+    Every requested path is in the result; images without annotations map to
+    an empty list. Returns None if the query fails.
+    """
+    image_paths = list(dict.fromkeys(image_paths))
+    annotations_by_path = {path: [] for path in image_paths}
+    try:
+        for start in range(0, len(image_paths), _PATHS_PER_QUERY):
+            chunk = image_paths[start:start + _PATHS_PER_QUERY]
+            sql = _SELECT_ANNOTATIONS_FOR_PATHS.format(", ".join("?" * len(chunk)))
+            for path, anno_id, image_id, class_id, x1, y1, x2, y2 in conn.execute(sql, chunk):
+                annotations_by_path[path].append(Annotation(anno_id, image_id, class_id, x1, y1, x2, y2))
+        logger.debug("Retrieved annotations for %d images", len(image_paths))
+        return annotations_by_path
+    except sqlite3.Error as e:
+        logger.error(f"Error getting annotations for {len(image_paths)} images: {e}")
+        return None
+
+def get_annotation_batch_for_image(conn, image_id):
+    """
+    Get all annotations for a given image ID as an AnnotationBatch.
+    """
+    try:
+        rows = conn.execute(_SELECT_ANNOTATIONS, (image_id,)).fetchall()
+        batch = AnnotationBatch(
+            ids=[row[0] for row in rows],
+            image_ids=[image_id] * len(rows),
+            class_ids=[row[1] for row in rows],
+            xyxy=[row[2:] for row in rows]
+        )
+        logger.debug("Retrieved batch of %d annotations for image ID: %s", len(batch), image_id)
+        return batch
+    except sqlite3.Error as e:
+        logger.error(f"Error getting annotation batch for image ID {image_id}: {e}")
+        return AnnotationBatch([], [], [], [])
+
 def update_annotation(conn, annotation):
     """
     Update an existing annotation.
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE annotations SET class_id = ?, x1 = ?, y1 = ?, x2 = ?, y2 = ? WHERE id = ?",
+        conn.execute(
+            _UPDATE_ANNOTATION,
             (annotation.class_id, annotation.x1, annotation.y1, annotation.x2, annotation.y2, annotation.id)
         )
-        conn.commit()
-        logger.info(f"Updated annotation with ID: {annotation.id}")
+        logger.debug("Updated annotation with ID: %s", annotation.id)
         return True
     except sqlite3.Error as e:
         logger.error(f"Error updating annotation with ID {annotation.id}: {e}")
@@ -133,11 +248,16 @@ def get_image_id_by_path(conn, image_path):
     """
     Get the ID of an image from its path.
     """
+    cache = _image_id_cache(conn)
+    if cache is not None and image_path in cache:
+        return cache[image_path]
     try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM images WHERE path = ?", (image_path,))
-        result = cursor.fetchone()
-        return result[0] if result else None
+        result = conn.execute(_SELECT_IMAGE_ID, (image_path,)).fetchone()
+        if result is None:
+            return None
+        if cache is not None:
+            cache[image_path] = result[0]
+        return result[0]
     except sqlite3.Error as e:
         logger.error(f"Error getting image ID for path {image_path}: {e}")
         return None
@@ -147,10 +267,8 @@ def delete_annotation(conn, annotation_id):
     Delete an annotation by its ID.
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM annotations WHERE id = ?", (annotation_id,))
-        conn.commit()
-        logger.info(f"Deleted annotation with ID: {annotation_id}")
+        conn.execute(_DELETE_ANNOTATION, (annotation_id,))
+        logger.debug("Deleted annotation with ID: %s", annotation_id)
         return True
     except sqlite3.Error as e:
         logger.error(f"Error deleting annotation with ID {annotation_id}: {e}")
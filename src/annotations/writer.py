@@ -0,0 +1,128 @@
+"""
+Background writer for annotation records.
+"""
+import logging
+from PySide6.QtCore import QObject, Signal, Slot
+from .annotation import Annotation
+from . import storage
+
+logger = logging.getLogger(__name__)
+
+class AnnotationWriter(QObject):
+    """
+    Saves annotations to the SQLite database on a worker thread.
+    Move the writer to a QThread and emit the *_requested signals from the GUI
+    thread. Requests run in the order they were emitted. Inserts report back
+    through annotation_created or write_failed; failed updates and deletes
+    through change_failed. The writer opens its own connection inside the
+    worker thread on first use.
+
+    Updates and deletes may be requested with an ID of None for an annotation
+    whose insert has not reported back yet. The writer remembers the ID it
+    inserted each annotation under and applies them to that record, so they
+    do not depend on the GUI thread handling annotation_created first. Emit
+    release_requested once the GUI has stored the ID on the annotation.
+    """
+    # annotation, image path, (class_id, x1, y1, x2, y2) snapshot to insert
+    create_requested = Signal(object, str, object)
+    # annotation, (id or None, class_id, x1, y1, x2, y2) snapshot to write
+    update_requested = Signal(object, object)
+    # annotation, ID of the record to delete or None
+    delete_requested = Signal(object, object)
+    # annotation whose ID the GUI now knows
+    release_requested = Signal(object)
+    # annotation, image ID, new annotation ID
+    annotation_created = Signal(object, object, object)
+    # annotation, error message
+    write_failed = Signal(object, str)
+    # annotation, error message
+    change_failed = Signal(object, str)
+
+    def __init__(self, db_file):
+        super().__init__()
+        self.db_file = db_file
+        self._conn = None
+        # id(annotation) -> (annotation, inserted ID) until the GUI releases it
+        self._inserted = {}
+        self.create_requested.connect(self._create)
+        self.update_requested.connect(self._update)
+        self.delete_requested.connect(self._delete)
+        self.release_requested.connect(self._release)
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = storage.create_connection(self.db_file)
+            if self._conn is None:
+                raise ConnectionError(f"Could not open database: {self.db_file}")
+        return self._conn
+
+    def _resolve_id(self, annotation, anno_id):
+        """
+        Return anno_id, or the ID this writer inserted the annotation under if it is None.
+        """
+        if anno_id is None:
+            entry = self._inserted.get(id(annotation))
+            if entry is not None:
+                anno_id = entry[1]
+        return anno_id
+
+    @Slot(object, str, object)
+    def _create(self, annotation, image_path, values):
+        try:
+            conn = self._connection()
+            image_id = storage.get_or_create_image(conn, image_path)
+            if image_id is None:
+                raise ConnectionError("Failed to get or create image record.")
+
+            class_id, x1, y1, x2, y2 = values
+            record = Annotation(id=None, image_id=image_id, class_id=class_id, x1=x1, y1=y1, x2=x2, y2=y2)
+            anno_id = storage.create_annotation(conn, record)
+            if anno_id is None:
+                raise ConnectionError("Failed to create annotation record.")
+
+            self._inserted[id(annotation)] = (annotation, anno_id)
+            self.annotation_created.emit(annotation, image_id, anno_id)
+        except Exception as e:
+            logger.error(f"Error saving annotation: {e}")
+            self.write_failed.emit(annotation, str(e))
+
+    @Slot(object, object)
+    def _update(self, annotation, values):
+        try:
+            anno_id, class_id, x1, y1, x2, y2 = values
+            anno_id = self._resolve_id(annotation, anno_id)
+            if anno_id is None:
+                return # Its insert failed, which was already reported
+            record = Annotation(id=anno_id, image_id=None, class_id=class_id, x1=x1, y1=y1, x2=x2, y2=y2)
+            if not storage.update_annotation(self._connection(), record):
+                raise ConnectionError(f"Failed to update annotation {anno_id}.")
+        except Exception as e:
+            logger.error(f"Error updating annotation: {e}")
+            self.change_failed.emit(annotation, str(e))
+
+    @Slot(object, object)
+    def _delete(self, annotation, anno_id):
+        try:
+            anno_id = self._resolve_id(annotation, anno_id)
+            self._inserted.pop(id(annotation), None)
+            if anno_id is None:
+                return # Its insert failed, which was already reported
+            if not storage.delete_annotation(self._connection(), anno_id):
+                raise ConnectionError(f"Failed to delete annotation {anno_id}.")
+        except Exception as e:
+            logger.error(f"Error deleting annotation: {e}")
+            self.change_failed.emit(annotation, str(e))
+
+    @Slot(object)
+    def _release(self, annotation):
+        self._inserted.pop(id(annotation), None)
+
+    @Slot()
+    def close(self):
+        """
+        Close the writer's connection. Invoke it through the writer's thread with a
+        queued connection, so it runs after every request queued before it.
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
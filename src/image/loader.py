@@ -0,0 +1,70 @@
+"""
+Background image loading.
+"""
+import logging
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+logger = logging.getLogger(__name__)
+
+class _ImageLoadTask(QRunnable):
+    """
+    Decodes one image on a pool thread and reports back through the loader's signals.
+    """
+    def __init__(self, loader, image_path):
+        super().__init__()
+        self.loader = loader
+        self.image_path = image_path
+
+    def run(self):
+        try:
+            # Imported here so OpenCV loads on a pool thread with the first image,
+            # not on the GUI thread while the application starts. A failing
+            # import is reported through load_failed like any other error.
+            from . import processing
+            # QPixmap may only be created on the GUI thread, so hand over a QImage
+            q_image = processing.load_image_as_qimage(self.image_path)
+            if q_image is None:
+                self.loader.load_failed.emit(self.image_path, "The file could not be decoded.")
+            else:
+                self.loader.image_loaded.emit(self.image_path, q_image)
+        except Exception as e:
+            logger.error(f"Error loading image {self.image_path}: {e}")
+            self.loader.load_failed.emit(self.image_path, str(e))
+
+class ImageLoader(QObject):
+    """
+    Loads images on its own QThreadPool. Create the loader on the GUI thread;
+    results arrive there through image_loaded or load_failed. A path that is
+    already being loaded is not submitted again.
+    """
+    # image path, QImage
+    image_loaded = Signal(str, object)
+    # image path, error message
+    load_failed = Signal(str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Not the global pool, so waiting for loads never waits on other work
+        # such as folder scans
+        self._pool = QThreadPool(self)
+        self._in_flight = set()
+        self.image_loaded.connect(self._on_finished)
+        self.load_failed.connect(self._on_finished)
+
+    def request(self, image_path):
+        """
+        Start loading an image unless it is already being loaded.
+        """
+        if image_path in self._in_flight:
+            return
+        self._in_flight.add(image_path)
+        self._pool.start(_ImageLoadTask(self, image_path))
+
+    def wait_for_done(self):
+        """
+        Block until all submitted image loads have finished.
+        """
+        self._pool.waitForDone()
+
+    def _on_finished(self, image_path, *_):
+        self._in_flight.discard(image_path)
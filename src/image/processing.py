@@ -2,27 +2,90 @@
 Image loading and manipulation.
 """
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 import cv2
-from PySide6.QtGui import QPixmap, QImage
+import numpy as np
+from PySide6.QtGui import QPixmap, QImage, QImageReader
 
 logger = logging.getLogger(__name__)
 
-def load_image_as_pixmap(image_path):
+# cv2.imread flags for decoding at 1/N resolution. JPEG decodes natively at
+# the reduced size; other formats are decoded fully and then downscaled.
+_REDUCED_READ_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+def load_image_as_qimage(image_path, reduction=1):
     """
-    Load an image from a file path and return a QPixmap.
+    Load an image from a file path and return a QImage.
+    A reduction of 2, 4 or 8 decodes the image at that fraction of its size,
+    which is much cheaper for previews and thumbnails.
     """
+    if reduction not in _REDUCED_READ_FLAGS:
+        raise ValueError(f"Unsupported reduction factor: {reduction}")
     try:
-        logger.info(f"Attempting to load image: {image_path}")
-        cv_image = cv2.imread(image_path)
+        logger.info("Attempting to load image: %s", image_path)
+        cv_image = cv2.imread(image_path, _REDUCED_READ_FLAGS[reduction])
         if cv_image is not None:
             height, width, channel = cv_image.shape
-            bytes_per_line = 3 * width
-            q_image = QImage(cv_image.data, width, height, bytes_per_line, QImage.Format_RGB888).rgbSwapped()
-            logger.info(f"Successfully loaded image: {image_path}")
-            return QPixmap.fromImage(q_image)
+            # Format_RGB32 is what QPixmap uses natively, so QPixmap.fromImage on
+            # the GUI thread is a plain copy instead of a per-pixel conversion.
+            # On little-endian machines its bytes are B, G, R, 0xFF, i.e. OpenCV's
+            # BGRA, which OpenCV writes straight into the QImage's own buffer.
+            q_image = QImage(width, height, QImage.Format_RGB32)
+            bgra_view = np.ndarray(
+                (height, width, 4), dtype=np.uint8, buffer=q_image.bits(),
+                strides=(q_image.bytesPerLine(), 4, 1)
+            )
+            cv2.cvtColor(cv_image, cv2.COLOR_BGR2BGRA, dst=bgra_view)
+            logger.info("Successfully loaded image: %s", image_path)
+            return q_image
         else:
             logger.error(f"Failed to load image with OpenCV: {image_path}")
             return None
     except Exception as e:
         logger.error(f"An error occurred while loading image {image_path}: {e}")
         return None
+
+def load_image_as_pixmap(image_path, reduction=1):
+    """
+    Load an image from a file path and return a QPixmap.
+    See load_image_as_qimage for the meaning of reduction.
+    """
+    q_image = load_image_as_qimage(image_path, reduction)
+    if q_image is None:
+        return None
+    return QPixmap.fromImage(q_image)
+
+
+def get_image_size(image_path):
+    """
+    Return the (width, height) of an image without decoding its pixels.
+    Only the file header is read, so this is much cheaper than loading the image.
+    """
+    try:
+        size = QImageReader(image_path).size()
+        if size.isValid():
+            return size.width(), size.height()
+        logger.error(f"Failed to read image size: {image_path}")
+        return None
+    except Exception as e:
+        logger.error(f"An error occurred while reading image size {image_path}: {e}")
+        return None
+
+def get_image_sizes(image_paths):
+    """
+    Return the (width, height) of many images, in the same order as image_paths.
+    Header reads are I/O bound, so they run on a thread pool to overlap file access.
+    Entries for images that cannot be read are None.
+    """
+    image_paths = list(image_paths)
+    if len(image_paths) < 2:
+        return [get_image_size(path) for path in image_paths]
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(image_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(get_image_size, image_paths))
@@ -0,0 +1,127 @@
+"""
+Background scanning of folders for image files.
+"""
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+logger = logging.getLogger(__name__)
+
+# Matches file names ending in .png, .jpg or .jpeg in any letter case. One
+# call into the regex engine per name is several times faster than
+# splitting off and lowercasing the extension in Python.
+IMAGE_NAME_PATTERN = re.compile(r'\.(?:png|jpe?g)\Z', re.IGNORECASE)
+SCAN_CHUNK_SIZE = 256 # File names delivered per chunk_ready signal
+LISTING_CACHE_SIZE = 8 # Number of folder listings kept in memory
+
+# Folder path -> (modification time in ns, sorted image names), least recently
+# used first. Scans run on pool threads, so access goes through the lock.
+_listing_cache = OrderedDict()
+_listing_cache_lock = threading.Lock()
+
+def list_image_files(folder_path):
+    """
+    Return the sorted names of the image files directly inside a folder.
+    A folder whose modification time is unchanged since it was last listed
+    is answered from memory. Raises OSError if the folder cannot be read.
+    """
+    # Adding, removing or renaming an entry updates the folder's mtime
+    mtime = os.stat(folder_path).st_mtime_ns
+    with _listing_cache_lock:
+        cached = _listing_cache.get(folder_path)
+        if cached is not None and cached[0] == mtime:
+            _listing_cache.move_to_end(folder_path)
+            return list(cached[1])
+
+    image_files = _scan_image_files(folder_path)
+    with _listing_cache_lock:
+        _listing_cache[folder_path] = (mtime, tuple(image_files))
+        _listing_cache.move_to_end(folder_path)
+        while len(_listing_cache) > LISTING_CACHE_SIZE:
+            _listing_cache.popitem(last=False)
+    return image_files
+
+def _scan_image_files(folder_path):
+    # scandir reports the entry type with the name, so skipping directories
+    # needs no extra stat call per entry. The extension is checked first, so
+    # most non-image entries never reach is_file().
+    is_image_name = IMAGE_NAME_PATTERN.search
+    with os.scandir(folder_path) as entries:
+        image_files = [
+            entry.name for entry in entries
+            if is_image_name(entry.name) and entry.is_file()
+        ]
+    # Sorted once here, case-insensitively; the list widget does no sorting.
+    # Names differing only in case keep a fixed order via the plain sort.
+    image_files.sort()
+    image_files.sort(key=str.casefold)
+    return image_files
+
+class _FolderScanTask(QRunnable):
+    """
+    Lists one folder on a pool thread and reports back through the scanner's signals.
+    """
+    def __init__(self, scanner, scan_id, folder_path):
+        super().__init__()
+        self.scanner = scanner
+        self.scan_id = scan_id
+        self.folder_path = folder_path
+
+    def run(self):
+        try:
+            image_files = list_image_files(self.folder_path)
+        except OSError as e:
+            logger.error(f"Error accessing folder {self.folder_path}: {e}")
+            if self.scanner.is_current(self.scan_id):
+                self.scanner.scan_failed.emit(self.scan_id, str(e))
+            return
+        # Checked before every emit: once cancelled, e.g. because the window
+        # closed, the scanner may already be gone
+        for start in range(0, len(image_files), SCAN_CHUNK_SIZE):
+            if not self.scanner.is_current(self.scan_id):
+                return # Cancelled or superseded; nobody wants the rest
+            self.scanner.chunk_ready.emit(self.scan_id, image_files[start:start + SCAN_CHUNK_SIZE])
+        if self.scanner.is_current(self.scan_id):
+            self.scanner.scan_finished.emit(self.scan_id, len(image_files))
+
+class FolderScanner(QObject):
+    """
+    Lists image files on the global QThreadPool. Create the scanner on the GUI
+    thread; results arrive there in sorted chunks through chunk_ready, followed
+    by scan_finished, or scan_failed. Every scan gets an ID so results of a
+    scan that was cancelled or superseded by a newer one can be ignored.
+    """
+    # scan ID, list of file names
+    chunk_ready = Signal(int, list)
+    # scan ID, total number of files
+    scan_finished = Signal(int, int)
+    # scan ID, error message
+    scan_failed = Signal(int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool.globalInstance()
+        self._last_scan_id = 0
+
+    def scan(self, folder_path):
+        """
+        Start listing a folder and return the ID of the new scan.
+        """
+        self._last_scan_id += 1
+        self._pool.start(_FolderScanTask(self, self._last_scan_id, folder_path))
+        return self._last_scan_id
+
+    def cancel(self):
+        """
+        Cancel the running scan. Chunks it has not delivered yet are dropped.
+        """
+        self._last_scan_id += 1
+
+    def is_current(self, scan_id):
+        """
+        Return True if scan_id belongs to the most recently started scan.
+        """
+        return scan_id == self._last_scan_id
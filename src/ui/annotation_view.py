@@ -3,11 +3,154 @@ Widget for displaying annotation data in a table.
 """
 import logging
 from PySide6.QtWidgets import QTableView
-from PySide6.QtGui import QStandardItemModel, QStandardItem
-from PySide6.QtCore import Signal, Qt # Import Qt for UserRole
+from PySide6.QtCore import Signal, Slot, Qt, QAbstractTableModel, QModelIndex
 
 logger = logging.getLogger(__name__)
 
+# Compared in the model's data() and headerData(), which run for every role
+# of every visible cell. PySide6 resolves a member accessed through the Qt
+# namespace (e.g. Qt.DisplayRole) anew on each access, at a few microseconds
+# each, so they are looked up once here.
+_DISPLAY_ROLE = Qt.DisplayRole
+_USER_ROLE = Qt.UserRole
+_HORIZONTAL = Qt.Horizontal
+
+# Bound once so each coordinate cell formats without re-parsing the spec.
+# (numpy.char.mod was measured slower than this for table-sized inputs.)
+_format_coord = "{:.4f}".format
+
+def _format_row(annotation):
+    """
+    Return the display strings for one table row.
+    """
+    return (
+        str(annotation.id),
+        str(annotation.class_id),
+        _format_coord(annotation.x1),
+        _format_coord(annotation.y1),
+        _format_coord(annotation.x2),
+        _format_coord(annotation.y2),
+    )
+
+class AnnotationTableModel(QAbstractTableModel):
+    """
+    Table model backed by a plain list of Annotation objects.
+    Each row's display strings are formatted once and cached until the
+    annotation changes, so data() is a plain lookup during paints and scrolls.
+    """
+    HEADERS = ('ID', 'Class ID', 'X1', 'Y1', 'X2', 'Y2')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._display = [] # Formatted cell text, parallel to _rows
+        # Row index of each annotation, keyed by object identity: unsaved
+        # annotations have no database ID yet, and the image view always
+        # passes the same Annotation objects it handed to the table. Saved
+        # annotations are also indexed by database ID as a fallback.
+        self._row_by_annotation = {}
+        self._row_by_id = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=_DISPLAY_ROLE):
+        if not index.isValid():
+            return None
+        if role == _DISPLAY_ROLE:
+            return self._display[index.row()][index.column()]
+        if role == _USER_ROLE:
+            return self._rows[index.row()] # The full annotation object, for any column
+        return None
+
+    def headerData(self, section, orientation, role=_DISPLAY_ROLE):
+        if role == _DISPLAY_ROLE and orientation == _HORIZONTAL:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def annotation_at(self, row):
+        """
+        Return the annotation shown in the given row.
+        """
+        return self._rows[row]
+
+    def row_of(self, annotation):
+        """
+        Return the row of the given annotation, or None if it is not in the model.
+        """
+        row = self._row_by_annotation.get(id(annotation))
+        if row is None and annotation.id is not None:
+            row = self._row_by_id.get(annotation.id)
+        return row
+
+    def _index_rows_from(self, first_row):
+        """
+        Rebuild the row lookups for rows first_row and below.
+        """
+        for row in range(first_row, len(self._rows)):
+            annotation = self._rows[row]
+            self._row_by_annotation[id(annotation)] = row
+            if annotation.id is not None:
+                self._row_by_id[annotation.id] = row
+
+    def set_annotations(self, annotations):
+        """
+        Replace all rows with the given annotations.
+        """
+        self.beginResetModel()
+        self._rows = list(annotations)
+        self._display = [_format_row(annotation) for annotation in self._rows]
+        self._row_by_annotation = {}
+        self._row_by_id = {}
+        self._index_rows_from(0)
+        self.endResetModel()
+
+    def append(self, annotation):
+        """
+        Append a single annotation as a new row.
+        """
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(annotation)
+        self._display.append(_format_row(annotation))
+        self._index_rows_from(row)
+        self.endInsertRows()
+
+    def refresh(self, annotation):
+        """
+        Notify views that an annotation's values changed. Returns False if it is not in the model.
+        """
+        row = self.row_of(annotation)
+        if row is None:
+            return False
+        if annotation.id is not None:
+            # A freshly saved annotation gets its database ID here
+            self._row_by_id[annotation.id] = row
+        self._display[row] = _format_row(annotation)
+        # One range signal for the whole row; only the display text changed
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1), [_DISPLAY_ROLE])
+        return True
+
+    def remove(self, annotation):
+        """
+        Remove an annotation's row. Returns False if it is not in the model.
+        """
+        row = self.row_of(annotation)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        removed = self._rows.pop(row)
+        del self._display[row]
+        del self._row_by_annotation[id(removed)]
+        self._row_by_id.pop(removed.id, None)
+        # Only the rows after the removed one change position
+        self._index_rows_from(row)
+        self.endRemoveRows()
+        return True
+
 class AnnotationView(QTableView):
     """
     Widget to display annotation data.
@@ -16,93 +159,63 @@ class AnnotationView(QTableView):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.model = QStandardItemModel(self)
-        self.model.setHorizontalHeaderLabels(['ID', 'Class ID', 'X1', 'Y1', 'X2', 'Y2'])
+        self.model = AnnotationTableModel(self)
         self.setModel(self.model)
         self.clicked.connect(self._on_table_clicked) # Connect table click to handler
         logger.info("Annotation view initialized.")
 
+    @Slot(QModelIndex)
     def _on_table_clicked(self, index):
         """
         Handle a click on the table.
         """
-        item = self.model.item(index.row(), 0) # Get the ID item
-        if item:
-            annotation = item.data(Qt.UserRole) # Retrieve the Annotation object
-            if annotation:
-                self.annotation_selected_from_table.emit(annotation)
-                logger.debug(f"Annotation ID {annotation.id} selected from table.")
+        if index.isValid():
+            annotation = self.model.data(index, _USER_ROLE)
+            self.annotation_selected_from_table.emit(annotation)
+            logger.debug("Annotation ID %s selected from table.", annotation.id)
 
     def add_annotation(self, annotation):
         """
         Add a single annotation to the table.
         """
-        id_item = QStandardItem(str(annotation.id))
-        id_item.setData(annotation, Qt.UserRole) # Store the full annotation object
-        self.model.appendRow([
-            id_item,
-            QStandardItem(str(annotation.class_id)),
-            QStandardItem(f"{annotation.x1:.4f}"),
-            QStandardItem(f"{annotation.y1:.4f}"),
-            QStandardItem(f"{annotation.x2:.4f}"),
-            QStandardItem(f"{annotation.y2:.4f}"),
-        ])
-        logger.info(f"Annotation {annotation.id} added to the view.")
+        self.model.append(annotation)
+        logger.info("Annotation %s added to the view.", annotation.id)
 
     def clear_annotations(self):
         """
         Clear all annotations from the table.
         """
-        self.model.removeRows(0, self.model.rowCount())
+        self.model.set_annotations([])
         logger.info("Annotation view cleared.")
 
     def load_annotations(self, annotations):
         """
         Load a list of annotations into the table.
         """
-        self.clear_annotations()
-        for annotation in annotations:
-            self.add_annotation(annotation)
-        logger.info(f"Loaded {len(annotations)} annotations into the view.")
+        self.model.set_annotations(annotations)
+        logger.info("Loaded %s annotations into the view.", len(annotations))
 
+    @Slot(object)
     def update_annotation(self, annotation):
         """
         Update a single annotation in the table.
         """
-        for row in range(self.model.rowCount()):
-            item_id = self.model.item(row, 0)
-            if item_id:
-                stored_annotation = item_id.data(Qt.UserRole)
-                # Check if it's the same annotation object (for temporary ones)
-                # or if the IDs match (for saved ones)
-                if stored_annotation == annotation or (stored_annotation and stored_annotation.id == annotation.id):
-                    # Update the stored annotation object
-                    item_id.setData(annotation, Qt.UserRole)
-                    # Update the display text
-                    item_id.setText(str(annotation.id))
-                    self.model.item(row, 1).setText(str(annotation.class_id))
-                    self.model.item(row, 2).setText(f"{annotation.x1:.4f}")
-                    self.model.item(row, 3).setText(f"{annotation.y1:.4f}")
-                    self.model.item(row, 4).setText(f"{annotation.x2:.4f}")
-                    self.model.item(row, 5).setText(f"{annotation.y2:.4f}")
-                    logger.info(f"Annotation {annotation.id} updated in the view.")
-                    return
-        logger.warning(f"Annotation {annotation.id} not found in the view for update.")
+        if not self.model.refresh(annotation):
+            logger.warning(f"Annotation {annotation.id} not found in the view for update.")
+            return
+        logger.info("Annotation %s updated in the view.", annotation.id)
 
+    @Slot(object)
     def remove_annotation(self, annotation):
         """
         Remove a single annotation from the table.
         """
-        for row in range(self.model.rowCount()):
-            item_id = self.model.item(row, 0)
-            if item_id:
-                stored_annotation = item_id.data(Qt.UserRole)
-                if stored_annotation == annotation or (stored_annotation and stored_annotation.id == annotation.id):
-                    self.model.removeRow(row)
-                    logger.info(f"Annotation {annotation.id} removed from the view.")
-                    return
-        logger.warning(f"Annotation {annotation.id} not found in the view for removal.")
+        if not self.model.remove(annotation):
+            logger.warning(f"Annotation {annotation.id} not found in the view for removal.")
+            return
+        logger.info("Annotation %s removed from the view.", annotation.id)
 
+    @Slot(object)
     def select_annotation_in_table(self, annotation):
         """
         Selects the row corresponding to the given annotation in the table.
@@ -114,12 +227,9 @@ class AnnotationView(QTableView):
             logger.debug("Annotation deselected in image view, clearing table selection.")
             return
 
-        for row in range(self.model.rowCount()):
-            item_id = self.model.item(row, 0)
-            if item_id:
-                stored_annotation = item_id.data(Qt.UserRole)
-                if stored_annotation == annotation or (stored_annotation and stored_annotation.id == annotation.id):
-                    self.selectRow(row)
-                    logger.debug(f"Annotation ID {annotation.id} selected in table.")
-                    return
-        logger.warning(f"Annotation {annotation.id} not found in table for selection.")
+        row = self.model.row_of(annotation)
+        if row is None:
+            logger.warning(f"Annotation {annotation.id} not found in table for selection.")
+            return
+        self.selectRow(row)
+        logger.debug("Annotation ID %s selected in table.", annotation.id)
@@ -1,11 +1,97 @@
 """
 Widget for listing images in a folder.
 """
-from PySide6.QtWidgets import QListWidget
+import os
+from PySide6.QtWidgets import QListView
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
 
-class ImageListView(QListWidget):
+# Hoisted for data(), like the roles in annotation_view
+_DISPLAY_ROLE = Qt.DisplayRole
+_USER_ROLE = Qt.UserRole
+
+class ImageNameModel(QAbstractListModel):
+    """
+    List model backed by plain lists of file names and their full paths.
+    data() returns the file name for Qt.DisplayRole and the full path for Qt.UserRole.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names = []
+        self._paths = [] # Joined once when the names are added, parallel to _names
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index, role=_DISPLAY_ROLE):
+        if not index.isValid():
+            return None
+        if role == _DISPLAY_ROLE:
+            return self._names[index.row()]
+        if role == _USER_ROLE:
+            return self._paths[index.row()]
+        return None
+
+    def path_at(self, row):
+        """
+        Return the full path of the image in the given row, or None if there is no such row.
+        """
+        if 0 <= row < len(self._paths):
+            return self._paths[row]
+        return None
+
+    def reset(self, folder_path=None, names=()):
+        """
+        Replace all rows with the given file names from folder_path.
+        """
+        self.beginResetModel()
+        self._names = list(names)
+        self._paths = [os.path.join(folder_path, name) for name in self._names]
+        self.endResetModel()
+
+    def append(self, folder_path, names):
+        """
+        Append file names from folder_path as new rows.
+        """
+        if not names:
+            return
+        first = len(self._names)
+        self.beginInsertRows(QModelIndex(), first, first + len(names) - 1)
+        self._names.extend(names)
+        self._paths.extend(os.path.join(folder_path, name) for name in names)
+        self.endInsertRows()
+
+class ImageListView(QListView):
     """
     Widget to display a list of images.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.image_model = ImageNameModel(self)
+        self.setModel(self.image_model)
+        # Every row is a single line of text, so the layout can use one row height
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QListView.NoEditTriggers)
+
+    def clear(self):
+        """
+        Remove all images from the list.
+        """
+        self.image_model.reset()
+
+    def add_images(self, folder_path, names):
+        """
+        Append images from a folder to the list.
+        """
+        self.image_model.append(folder_path, names)
+
+    def count(self):
+        """
+        Return the number of images in the list.
+        """
+        return self.image_model.rowCount()
+
+    def image_path(self, row):
+        """
+        Return the full path of the image in the given row, or None if there is no such row.
+        """
+        return self.image_model.path_at(row)
@@ -2,20 +2,58 @@
 Widget for displaying the image.
 """
 import logging
+from collections import OrderedDict
+import numpy as np
 from PySide6.QtWidgets import QScrollArea, QLabel, QMessageBox, QInputDialog
-from PySide6.QtCore import Qt, QRect, QPoint, Signal, QRectF, QPointF
-from PySide6.QtGui import QPainter, QPen, QColor, QFont
-from ..image import processing
+from PySide6.QtCore import Qt, QPoint, Signal, Slot, QRectF, QPointF, QRect, QThread, QTimer, QCoreApplication, QMetaObject
+from PySide6.QtGui import QPainter, QPen, QColor, QFont, QFontMetrics, QImage, QPixmap, QPixmapCache
+from ..image.loader import ImageLoader
 from ..annotations.annotation import Annotation
 from ..annotations import storage
+from ..annotations.writer import AnnotationWriter
 
 logger = logging.getLogger(__name__)
 
 HANDLE_SIZE = 8 # Size of the resize handles
 HANDLE_MARGIN = 5 # Margin around edges for resize handles
+MOVE_UPDATE_INTERVAL_MS = 8 # Mouse moves within this window share one repaint
+SMOOTH_SCALE_DELAY_MS = 120 # Quiet time after a resize or new image before the smooth rescale
+ANNOTATION_CACHE_SIZE = 16 # Number of recently viewed images whose annotations stay loaded
+IMAGE_CACHE_SIZE = 5 # Number of decoded images kept for the current image and its neighbors
+SCALED_PIXMAP_CACHE_KB = 128 * 1024 # QPixmapCache budget for scaled copies of viewed images
 
 SELECTED_COLOR = QColor(0, 0, 255)  # Blue
 UNSELECTED_COLOR = QColor(255, 0, 0) # Red
+# Pens are built once here rather than on every paint
+SELECTED_PEN = QPen(SELECTED_COLOR, 2, Qt.SolidLine)
+UNSELECTED_PEN = QPen(UNSELECTED_COLOR, 2, Qt.SolidLine)
+LABEL_TEXT_PEN = QPen(Qt.white, 1)
+
+# Cursor shown when hovering over each part of a box with the select tool
+HANDLE_CURSORS = {
+    'body': Qt.SizeAllCursor,
+    'top-left': Qt.SizeFDiagCursor,
+    'bottom-right': Qt.SizeFDiagCursor,
+    'top-right': Qt.SizeBDiagCursor,
+    'bottom-left': Qt.SizeBDiagCursor,
+    'top': Qt.SizeVerCursor,
+    'bottom': Qt.SizeVerCursor,
+    'left': Qt.SizeHorCursor,
+    'right': Qt.SizeHorCursor,
+}
+
+def _rect_contains(x, y, w, h, px, py):
+    """
+    QRectF(x, y, w, h).contains(QPointF(px, py)) without building Qt objects:
+    edges are inclusive, negative sizes are normalized and empty rects contain nothing.
+    """
+    left, right = (x + w, x) if w < 0 else (x, x + w)
+    if left == right or px < left or px > right:
+        return False
+    top, bottom = (y + h, y) if h < 0 else (y, y + h)
+    if top == bottom or py < top or py > bottom:
+        return False
+    return True
 
 class _ImageLabel(QLabel):
     def __init__(self, parent_view):
@@ -25,16 +63,48 @@ class _ImageLabel(QLabel):
         self.start_point = QPointF()
         self.end_point = QPointF()
         self._pixmap = None
+        # The pixmap pre-scaled to the label size, rebuilt only when the
+        # pixmap or the label size changes.
+        self._scaled_pixmap = None
+        self._scaled_for_size = None
+        # A fresh size is first served by a cheap nearest-neighbor scale; the
+        # smooth one is built once resizing has paused for a moment.
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(SMOOTH_SCALE_DELAY_MS)
+        self._smooth_timer.timeout.connect(self._build_smooth_scaled)
+        # Image <-> widget mapping, rebuilt only when the pixmap or the label size changes
+        self._transform = None
 
         self.selected_annotation = None
         self.selection_handle = None # 'body', 'top-left', 'top-right', 'bottom-left', 'bottom-right', 'top', 'bottom', 'left', 'right'
         self.dragging = False
         self.last_mouse_pos = QPointF()
-        self.setMouseTracking(True) # Enable mouse tracking
+        self._label_font = QFont("Sans-serif", 12)
+        self._label_font.setBold(True)
+        # Label text -> (width, height) in the label font, filled while painting
+        self._label_sizes = {}
+        # Repaints, table updates and hover hit tests caused by mouse moves
+        # are collected here and flushed by a single-shot timer, so a high polling rate mouse does
+        # not queue more work than the display can show.
+        self._pending_dirty = QRect()
+        self._pending_changed = None
+        self._pending_hover_pos = None
+        self._cursor_shape = None # Shape last set on the widget, None for the default
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(MOVE_UPDATE_INTERVAL_MS)
+        self._update_timer.timeout.connect(self._flush_update)
+        # Hover moves are only needed for the select tool's cursor feedback;
+        # ImageView.set_tool turns tracking on for it
+        self.setMouseTracking(False)
         self.setFocusPolicy(Qt.StrongFocus) # Enable keyboard events
 
     def set_pixmap(self, pixmap):
+        self._flush_update() # Deliver pending changes for the previous image
         self._pixmap = pixmap
+        self._scaled_pixmap = None
+        self._transform = None
         if self._pixmap is None:
             self.setText("Open a folder to start annotating.")
         else:
@@ -42,26 +112,130 @@ class _ImageLabel(QLabel):
         self.selected_annotation = None # Clear selection on new image
         self.update()
 
-    def get_image_coords(self, widget_pos):
-        if not self._pixmap:
-            return None
-
-        pixmap_size = self._pixmap.size()
+    def _schedule_update(self, dirty, changed_annotation=None):
+        """
+        Queue a repaint of the dirty rectangle and, optionally, an
+        annotation_changing notification, to be sent when the timer fires.
+        """
+        self._pending_dirty = self._pending_dirty.united(dirty)
+        if changed_annotation is not None:
+            self._pending_changed = changed_annotation
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+
+    @Slot()
+    def _flush_update(self):
+        """
+        Send the repaint and notification collected by _schedule_update, and
+        update the hover cursor for the latest position.
+        """
+        self._update_timer.stop()
+        if not self._pending_dirty.isNull():
+            self.update(self._pending_dirty)
+            self._pending_dirty = QRect()
+        if self._pending_changed is not None:
+            annotation, self._pending_changed = self._pending_changed, None
+            self.parent_view.annotation_changing.emit(annotation) # Live preview while dragging
+        if self._pending_hover_pos is not None:
+            pos, self._pending_hover_pos = self._pending_hover_pos, None
+            self._update_hover_cursor(pos)
+
+    def _scaled_cache_key(self, size):
+        return f"scaled:{self._pixmap.cacheKey()}:{size.width()}x{size.height()}"
+
+    def _ensure_scaled(self):
+        """
+        Return the pixmap scaled to fit the label, rescaling only if needed.
+        Smooth scaled copies are kept in QPixmapCache, keyed by the source
+        pixmap's cacheKey and the size, so revisiting an image or returning
+        to an earlier window size reuses them. Until the smooth copy for the
+        current size exists, a fast nearest-neighbor copy is shown.
+        """
         label_size = self.size()
+        if self._scaled_pixmap is None or self._scaled_for_size != label_size:
+            scaled = QPixmapCache.find(self._scaled_cache_key(label_size))
+            if scaled is None:
+                scaled = self._pixmap.scaled(label_size, Qt.KeepAspectRatio, Qt.FastTransformation)
+                self._smooth_timer.start() # Restarted on every new size while resizing
+            self._scaled_pixmap = scaled
+            self._scaled_for_size = label_size
+        return self._scaled_pixmap
+
+    @Slot()
+    def _build_smooth_scaled(self):
+        """
+        Replace the fast scaled copy with a smooth one for the current size.
+        """
+        if self._pixmap is None:
+            return
+        label_size = self.size()
+        key = self._scaled_cache_key(label_size)
+        if QPixmapCache.find(key) is None:
+            QPixmapCache.insert(key, self._pixmap.scaled(label_size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self._scaled_pixmap = None # Picked up from the cache on the next paint
+        self.update()
 
-        scaled_size = pixmap_size.scaled(label_size, Qt.KeepAspectRatio)
+    def resizeEvent(self, event):
+        self._transform = None
+        super().resizeEvent(event)
+
+    def _view_transform(self):
+        """
+        Return (scale_x, scale_y, offset_x, offset_y, target_w, target_h) for
+        mapping image pixels to widget coordinates: widget = pixel * scale + offset.
+        """
+        if self._transform is None:
+            label_size = self.size()
+            pixmap_size = self._pixmap.size()
+            target_size = pixmap_size.scaled(label_size, Qt.KeepAspectRatio)
+            target_w = target_size.width()
+            target_h = target_size.height()
+            self._transform = (
+                target_w / pixmap_size.width(),
+                target_h / pixmap_size.height(),
+                (label_size.width() - target_w) / 2,
+                (label_size.height() - target_h) / 2,
+                target_w,
+                target_h,
+            )
+        return self._transform
 
-        offset_x = (label_size.width() - scaled_size.width()) / 2
-        offset_y = (label_size.height() - scaled_size.height()) / 2
+    def get_image_coords(self, widget_pos):
+        if not self._pixmap:
+            return None
 
-        if not (offset_x <= widget_pos.x() < offset_x + scaled_size.width() and
-                offset_y <= widget_pos.y() < offset_y + scaled_size.height()):
+        scale_x, scale_y, offset_x, offset_y, target_w, target_h = self._view_transform()
+        dx = widget_pos.x() - offset_x
+        dy = widget_pos.y() - offset_y
+        if not (0 <= dx < target_w and 0 <= dy < target_h):
             return None
 
-        image_x = (widget_pos.x() - offset_x) * pixmap_size.width() / scaled_size.width()
-        image_y = (widget_pos.y() - offset_y) * pixmap_size.height() / scaled_size.height()
+        return QPointF(dx / scale_x, dy / scale_y)
 
-        return QPointF(image_x, image_y)
+    def _to_widget_rect(self, pixel_rect_f):
+        """
+        Map a rectangle in image pixel coordinates to widget coordinates.
+        """
+        scale_x, scale_y, offset_x, offset_y, _, _ = self._view_transform()
+        return QRectF(pixel_rect_f.x() * scale_x + offset_x, pixel_rect_f.y() * scale_y + offset_y,
+                      pixel_rect_f.width() * scale_x, pixel_rect_f.height() * scale_y)
+
+    def _dirty_rect(self, pixel_rect_f, class_id=None):
+        """
+        Widget area covered when a box is painted: its outline, resize handles
+        and, if class_id is given, the class label drawn above it.
+        """
+        # Handles reach up to this many image pixels outside the box
+        grow = max(HANDLE_SIZE // 2, HANDLE_MARGIN)
+        outer_rect_f = self._to_widget_rect(pixel_rect_f.adjusted(-grow, -grow, grow, grow))
+        dirty = outer_rect_f.toAlignedRect().adjusted(-2, -2, 2, 2) # Pen width
+        if class_id is not None:
+            widget_rect_f = self._to_widget_rect(pixel_rect_f)
+            text_rect = QFontMetrics(self._label_font).boundingRect(str(class_id))
+            label_rect_f = QRectF(widget_rect_f.x(), widget_rect_f.y() - text_rect.height(),
+                                  text_rect.width(), text_rect.height())
+            dirty = dirty.united(label_rect_f.toAlignedRect().adjusted(-1, -1, 1, 1))
+        return dirty
 
     def _norm_to_pixel_rect(self, annotation, img_w, img_h):
         x1_pixel = annotation.x1 * img_w
@@ -77,24 +251,35 @@ class _ImageLabel(QLabel):
         y2_norm = (pixel_rect_f.top() + pixel_rect_f.height()) / img_h
         return [x1_norm, y1_norm, x2_norm, y2_norm]
 
-    def _get_handle_rects(self, pixel_rect_f):
-        handles = {}
+    def _handle_geometry(self, x, y, w, h):
+        """
+        Return the resize handles of the box (x, y, w, h) as (name, x, y, w, h)
+        tuples, corners first, in image pixel coordinates.
+        """
         hs = HANDLE_SIZE // 2
         hm = HANDLE_MARGIN
+        right = x + w
+        bottom = y + h
+        return (
+            # Corner handles
+            ('top-left', x - hs, y - hs, HANDLE_SIZE, HANDLE_SIZE),
+            ('top-right', right - hs, y - hs, HANDLE_SIZE, HANDLE_SIZE),
+            ('bottom-left', x - hs, bottom - hs, HANDLE_SIZE, HANDLE_SIZE),
+            ('bottom-right', right - hs, bottom - hs, HANDLE_SIZE, HANDLE_SIZE),
+            # Edge handles
+            ('top', x + hs, y - hm, w - 2 * hs, 2 * hm),
+            ('bottom', x + hs, bottom - hm, w - 2 * hs, 2 * hm),
+            ('left', x - hm, y + hs, 2 * hm, h - 2 * hs),
+            ('right', right - hm, y + hs, 2 * hm, h - 2 * hs),
+        )
 
-        # Corner handles
-        handles['top-left'] = QRectF(pixel_rect_f.topLeft().x() - hs, pixel_rect_f.topLeft().y() - hs, HANDLE_SIZE, HANDLE_SIZE)
-        handles['top-right'] = QRectF(pixel_rect_f.topRight().x() - hs, pixel_rect_f.topRight().y() - hs, HANDLE_SIZE, HANDLE_SIZE)
-        handles['bottom-left'] = QRectF(pixel_rect_f.bottomLeft().x() - hs, pixel_rect_f.bottomLeft().y() - hs, HANDLE_SIZE, HANDLE_SIZE)
-        handles['bottom-right'] = QRectF(pixel_rect_f.bottomRight().x() - hs, pixel_rect_f.bottomRight().y() - hs, HANDLE_SIZE, HANDLE_SIZE)
-
-        # Edge handles
-        handles['top'] = QRectF(pixel_rect_f.left() + hs, pixel_rect_f.top() - hm, pixel_rect_f.width() - 2 * hs, 2 * hm)
-        handles['bottom'] = QRectF(pixel_rect_f.left() + hs, pixel_rect_f.bottom() - hm, pixel_rect_f.width() - 2 * hs, 2 * hm)
-        handles['left'] = QRectF(pixel_rect_f.left() - hm, pixel_rect_f.top() + hs, 2 * hm, pixel_rect_f.height() - 2 * hs)
-        handles['right'] = QRectF(pixel_rect_f.right() - hm, pixel_rect_f.top() + hs, 2 * hm, pixel_rect_f.height() - 2 * hs)
-        
-        return handles
+    def _get_handle_rects(self, pixel_rect_f):
+        return tuple(
+            (name, QRectF(x, y, w, h))
+            for name, x, y, w, h in self._handle_geometry(
+                pixel_rect_f.x(), pixel_rect_f.y(), pixel_rect_f.width(), pixel_rect_f.height()
+            )
+        )
 
     def _hit_test(self, mouse_pos_img_coords):
         if not self._pixmap:
@@ -103,17 +288,36 @@ class _ImageLabel(QLabel):
         img_w = self._pixmap.width()
         img_h = self._pixmap.height()
 
-        for annotation in reversed(self.parent_view.annotations): # Check top-most annotations first
-            pixel_rect_f = self._norm_to_pixel_rect(annotation, img_w, img_h)
-            
+        # Narrow the search with one vectorized test: a box can only be hit if
+        # the point lies within the box grown by the handle reach (plus a pixel
+        # of slack for rounding). The exact checks below run on those only.
+        annotations = self.parent_view.annotations
+        if not annotations:
+            return None, None
+        grow = max(HANDLE_SIZE // 2, HANDLE_MARGIN) + 1
+        boxes = np.array([(a.x1, a.y1, a.x2, a.y2) for a in annotations], dtype=np.float64) * (img_w, img_h, img_w, img_h)
+        mx = mouse_pos_img_coords.x()
+        my = mouse_pos_img_coords.y()
+        candidates = np.flatnonzero(
+            (boxes[:, 0] - grow <= mx) & (mx <= boxes[:, 2] + grow) &
+            (boxes[:, 1] - grow <= my) & (my <= boxes[:, 3] + grow)
+        )
+
+        for index in candidates[::-1]: # Check top-most annotations first
+            annotation = annotations[index]
+            # Same values _norm_to_pixel_rect would put in a QRectF
+            x = annotation.x1 * img_w
+            y = annotation.y1 * img_h
+            w = annotation.x2 * img_w - x
+            h = annotation.y2 * img_h - y
+
             # Check handles first
-            handles = self._get_handle_rects(pixel_rect_f)
-            for handle_name, handle_rect_f in handles.items():
-                if handle_rect_f.contains(mouse_pos_img_coords):
+            for handle_name, hx, hy, hw, hh in self._handle_geometry(x, y, w, h):
+                if _rect_contains(hx, hy, hw, hh, mx, my):
                     return annotation, handle_name
-            
+
             # Check body of the bounding box
-            if pixel_rect_f.contains(mouse_pos_img_coords):
+            if _rect_contains(x, y, w, h, mx, my):
                 return annotation, 'body'
         
         return None, None
@@ -146,14 +350,14 @@ class _ImageLabel(QLabel):
             self.drawing = True
             self.start_point = mouse_pos_img_coords
             self.end_point = mouse_pos_img_coords
-            logger.debug(f"Mouse press: start drawing at {self.start_point}")
+            logger.debug("Mouse press: start drawing at %s", self.start_point)
             self.update()
         elif self.parent_view.tool == "select" and event.button() == Qt.LeftButton:
             self.selected_annotation, self.selection_handle = self._hit_test(mouse_pos_img_coords)
             if self.selected_annotation:
                 self.dragging = True
                 self.last_mouse_pos = mouse_pos_img_coords
-                logger.debug(f"Selected annotation ID: {self.selected_annotation.id}, handle: {self.selection_handle}")
+                logger.debug("Selected annotation ID: %s, handle: %s", self.selected_annotation.id, self.selection_handle)
                 self.parent_view.annotation_selected_on_image.emit(self.selected_annotation)
             else:
                 self.selected_annotation = None # Clicked outside, deselect
@@ -161,20 +365,42 @@ class _ImageLabel(QLabel):
                 self.parent_view.annotation_selected_on_image.emit(None) # Emit None for deselection
             self.update()
 
+    def _set_cursor_shape(self, shape):
+        """
+        Set the widget cursor, or reset it if shape is None. Does nothing if it is already set.
+        """
+        if shape == self._cursor_shape:
+            return
+        self._cursor_shape = shape
+        if shape is None:
+            self.unsetCursor()
+        else:
+            self.setCursor(shape)
+
     def mouseMoveEvent(self, event):
+        if not self.drawing and not self.dragging and self.parent_view.tool != "select":
+            # Hovering only matters to the select tool
+            self._set_cursor_shape(None)
+            return
+
         mouse_pos_img_coords = self.get_image_coords(event.pos())
         if not mouse_pos_img_coords:
-            self.unsetCursor() # Reset cursor if outside image area
+            self._pending_hover_pos = None
+            self._set_cursor_shape(None) # Reset cursor if outside image area
             return
 
         if self.drawing:
+            # Repaint only the area of the previous and the new preview box
+            old_dirty = self._dirty_rect(QRectF(self.start_point, self.end_point).normalized())
             self.end_point = mouse_pos_img_coords
-            self.update()
+            new_dirty = self._dirty_rect(QRectF(self.start_point, self.end_point).normalized())
+            self._schedule_update(old_dirty.united(new_dirty))
         elif self.dragging and self.selected_annotation:
             img_w = self._pixmap.width()
             img_h = self._pixmap.height()
 
             current_pixel_rect_f = self._norm_to_pixel_rect(self.selected_annotation, img_w, img_h)
+            old_dirty = self._dirty_rect(current_pixel_rect_f, self.selected_annotation.class_id)
             new_pixel_rect_f = QRectF(current_pixel_rect_f)
 
             if self.selection_handle == 'body':
@@ -232,52 +458,46 @@ class _ImageLabel(QLabel):
             self.selected_annotation.y2 = norm_coords[3]
 
             self.last_mouse_pos = mouse_pos_img_coords
-            self.parent_view.annotation_changed.emit(self.selected_annotation) # Emit signal for real-time update
-            self.update()
+            # Repaint only where the box was and where it is now, and preview the change
+            self._schedule_update(old_dirty.united(self._dirty_rect(new_pixel_rect_f, self.selected_annotation.class_id)),
+                                  self.selected_annotation)
         else: # Not dragging, just hovering
-            if self.parent_view.tool == "select":
-                annotation, handle = self._hit_test(mouse_pos_img_coords)
-                if annotation:
-                    if handle == 'body':
-                        self.setCursor(Qt.SizeAllCursor)
-                    elif handle == 'top-left' or handle == 'bottom-right':
-                        self.setCursor(Qt.SizeFDiagCursor)
-                    elif handle == 'top-right' or handle == 'bottom-left':
-                        self.setCursor(Qt.SizeBDiagCursor)
-                    elif handle == 'top' or handle == 'bottom':
-                        self.setCursor(Qt.SizeVerCursor)
-                    elif handle == 'left' or handle == 'right':
-                        self.setCursor(Qt.SizeHorCursor)
-                else:
-                    self.unsetCursor()
-            else:
-                self.unsetCursor()
+            # The cursor only needs the latest position, so the hit test runs
+            # once per move-update interval instead of on every event
+            self._pending_hover_pos = mouse_pos_img_coords
+            if not self._update_timer.isActive():
+                self._update_timer.start()
+
+    def _update_hover_cursor(self, mouse_pos_img_coords):
+        """
+        Set the cursor for the annotation or handle under the given position.
+        """
+        if self.parent_view.tool == "select":
+            annotation, handle = self._hit_test(mouse_pos_img_coords)
+            self._set_cursor_shape(HANDLE_CURSORS[handle] if annotation else None)
+        else:
+            self._set_cursor_shape(None)
 
     def leaveEvent(self, event):
-        self.unsetCursor() # Reset cursor when mouse leaves the widget
+        self._pending_hover_pos = None
+        self._set_cursor_shape(None) # Reset cursor when mouse leaves the widget
 
     def keyPressEvent(self, event):
-        if event.key() == Qt.Key_Delete and self.selected_annotation:
-            deleted_annotation_id = self.selected_annotation.id # Store ID before clearing selected_annotation
-            logger.debug(f"Delete key pressed for annotation ID: {deleted_annotation_id}")
-            try:
-                conn = storage.create_connection("annotations.db")
-                if conn:
-                    if storage.delete_annotation(conn, deleted_annotation_id):
-                        self.parent_view.annotations.remove(self.selected_annotation)
-                        self.parent_view.annotation_deleted.emit(self.selected_annotation)
-                        self.selected_annotation = None # Deselect after deletion
-                        self.update()
-                        logger.info(f"Annotation ID {deleted_annotation_id} deleted successfully.")
-                    else:
-                        QMessageBox.critical(self.parent_view, "Error", "Failed to delete annotation from database.")
-                    conn.close()
-            except Exception as e:
-                logger.error(f"Error deleting annotation: {e}")
-                QMessageBox.critical(self.parent_view, "Error", f"Could not delete the annotation: {e}")
+        if event.key() == Qt.Key_Delete and self.selected_annotation and self.selected_annotation.id is None:
+            # Its insert is still in flight; the writer deletes the row right after it
+            self.parent_view.discard_pending_annotation(self.selected_annotation)
+            self.selected_annotation = None
+            self.update()
+        elif event.key() == Qt.Key_Delete and self.selected_annotation:
+            logger.debug("Delete key pressed for annotation ID: %s", self.selected_annotation.id)
+            # Removed from the view now, deleted from the database on the writer thread
+            self.parent_view.delete_saved_annotation(self.selected_annotation)
+            self.selected_annotation = None # Deselect after deletion
+            self.update()
         super().keyPressEvent(event)
 
     def mouseReleaseEvent(self, event):
+        self._flush_update() # Apply the last moves before finishing the gesture
         mouse_pos_img_coords = self.get_image_coords(event.pos())
         if not mouse_pos_img_coords:
             return
@@ -285,7 +505,7 @@ class _ImageLabel(QLabel):
         if self.drawing:
             self.drawing = False
             self.end_point = mouse_pos_img_coords
-            logger.debug(f"Mouse release: stop drawing at {self.end_point}")
+            logger.debug("Mouse release: stop drawing at %s", self.end_point)
 
             rect_f = QRectF(self.start_point, self.end_point).normalized()
             
@@ -315,32 +535,10 @@ class _ImageLabel(QLabel):
                     # Prompt user for class ID
                     class_id, ok = QInputDialog.getInt(self, "Class ID", "Enter Class ID:", 0, 0, 1000, 1)
                     if ok:
-                        try:
-                            conn = storage.create_connection("annotations.db")
-                            if conn:
-                                image_id = storage.get_or_create_image(conn, self.parent_view.current_image_path)
-                                if image_id is None:
-                                    raise ConnectionError("Failed to get or create image record.")
-
-                                temp_annotation.image_id = image_id
-                                temp_annotation.class_id = class_id
-
-                                anno_id = storage.create_annotation(conn, temp_annotation)
-                                if anno_id is None:
-                                    raise ConnectionError("Failed to create annotation record.")
-                                    
-                                temp_annotation.id = anno_id # Update with real ID
-                                
-                                self.parent_view.annotation_changed.emit(temp_annotation) # Update table with real ID and class ID
-                                
-                                conn.close()
-                        except Exception as e:
-                            logger.error(f"Error saving annotation: {e}")
-                            QMessageBox.critical(self.parent_view, "Error", f"Could not save the annotation: {e}")
-                            # If saving fails, remove the temporary annotation
-                            self.parent_view.annotations.remove(temp_annotation)
-                            self.parent_view.annotation_deleted.emit(temp_annotation)
-                            self.selected_annotation = None
+                        temp_annotation.class_id = class_id
+                        self.parent_view.annotation_changed.emit(temp_annotation) # Show the chosen class ID
+                        # Saved on the writer thread; the real ID arrives later
+                        self.parent_view.save_new_annotation(temp_annotation)
                     else:
                         logger.info("Annotation creation cancelled by user, removing temporary annotation.")
                         # If cancelled, remove the temporary annotation
@@ -351,17 +549,12 @@ class _ImageLabel(QLabel):
         elif self.dragging and self.selected_annotation:
             self.dragging = False
             self.selection_handle = None
-            # Save changes to DB
+            # Save changes to DB. An annotation whose insert is still in flight
+            # has no ID yet; the writer applies the update to the inserted row.
             if self.parent_view.current_image_path:
-                try:
-                    conn = storage.create_connection("annotations.db")
-                    if conn:
-                        storage.update_annotation(conn, self.selected_annotation)
-                        conn.close()
-                        self.parent_view.annotation_changed.emit(self.selected_annotation)
-                except Exception as e:
-                    logger.error(f"Error updating annotation: {e}")
-                    QMessageBox.critical(self.parent_view, "Error", f"Could not update the annotation: {e}")
+                self.parent_view.update_saved_annotation(self.selected_annotation)
+            # The drag is finished: one annotation_changed for the whole gesture
+            self.parent_view.annotation_changed.emit(self.selected_annotation)
             self.update()
 
     def paintEvent(self, event):
@@ -371,72 +564,92 @@ class _ImageLabel(QLabel):
             super().paintEvent(event)
             return
 
-        label_size = self.size()
-        pixmap_size = self._pixmap.size()
-        
-        target_size = pixmap_size.scaled(label_size, Qt.KeepAspectRatio)
-        
-        offset_x = (label_size.width() - target_size.width()) / 2
-        offset_y = (label_size.height() - target_size.height()) / 2
-        
-        target_rect = QRect(int(offset_x), int(offset_y), target_size.width(), target_size.height())
+        # Image pixel -> widget mapping, constant for the whole frame
+        scale_x, scale_y, offset_x, offset_y, target_w, target_h = self._view_transform()
 
-        painter.drawPixmap(target_rect, self._pixmap)
+        # Blit the cached, already scaled pixmap 1:1
+        painter.drawPixmap(QPoint(int(offset_x), int(offset_y)), self._ensure_scaled())
 
         img_w = self._pixmap.width()
         img_h = self._pixmap.height()
 
-        def to_widget_coords_from_pixels(image_point_f_tuple):
-            px = image_point_f_tuple[0] * target_size.width() / pixmap_size.width() + offset_x
-            py = image_point_f_tuple[1] * target_size.height() / pixmap_size.height() + offset_y
-            return QPointF(px, py)
-
-        for annotation in self.parent_view.annotations:
-            pixel_rect_f = self._norm_to_pixel_rect(annotation, img_w, img_h)
-            widget_rect_f = QRectF(to_widget_coords_from_pixels(pixel_rect_f.topLeft().toTuple()),
-                                   to_widget_coords_from_pixels(pixel_rect_f.bottomRight().toTuple()))
-
-            if annotation == self.selected_annotation:
-                painter.setPen(QPen(SELECTED_COLOR, 2, Qt.SolidLine)) # Blue for selected
+        annotations = self.parent_view.annotations
+        # Project every box from normalized to widget coordinates in one
+        # vectorized step: widget = norm * target_size + offset
+        norm_boxes = np.array([(a.x1, a.y1, a.x2, a.y2) for a in annotations], dtype=np.float64).reshape(-1, 4)
+        widget_boxes = norm_boxes * (target_w, target_h, target_w, target_h) + (offset_x, offset_y, offset_x, offset_y)
+
+        # Cull boxes whose painted area (outline, handles and the class label
+        # above the top-left corner) does not reach the exposed rectangle.
+        if len(annotations):
+            font_metrics = QFontMetrics(self._label_font)
+            max_class_id = max(annotation.class_id for annotation in annotations)
+            label_w = font_metrics.boundingRect(str(max_class_id)).width()
+            label_h = font_metrics.height()
+            margin = max(HANDLE_SIZE // 2, HANDLE_MARGIN) * scale_x + 2
+            exposed = QRectF(event.rect())
+            x1s, y1s, x2s, y2s = widget_boxes.T
+            visible = ((x1s - margin <= exposed.right()) &
+                       (np.maximum(x2s + margin, x1s + label_w) >= exposed.left()) &
+                       (y1s - label_h - margin <= exposed.bottom()) &
+                       (y2s + margin >= exposed.top()))
+            if not visible.all():
+                keep = np.flatnonzero(visible)
+                annotations = [annotations[i] for i in keep]
+                widget_boxes = widget_boxes[keep]
+
+        widget_rects = [QRectF(wx1, wy1, wx2 - wx1, wy2 - wy1) for wx1, wy1, wx2, wy2 in widget_boxes.tolist()]
+
+        # All unselected outlines share one pen, so submit them in a single call
+        painter.setPen(UNSELECTED_PEN) # Red for unselected
+        painter.drawRects([rect_f for annotation, rect_f in zip(annotations, widget_rects)
+                           if annotation is not self.selected_annotation])
+
+        painter.setFont(self._label_font)
+        label_metrics = painter.fontMetrics()
+        label_ascent = label_metrics.ascent()
+        label_sizes = self._label_sizes
+        # Boxes and labels are drawn in list order so overlapping labels stack
+        # as before; the text pen is only switched away for the selected box.
+        painter.setPen(LABEL_TEXT_PEN) # Text color
+        for annotation, widget_rect_f in zip(annotations, widget_rects):
+            if annotation is self.selected_annotation:
+                painter.setPen(SELECTED_PEN) # Blue for selected
                 painter.drawRect(widget_rect_f)
                 # Draw handles
-                handles = self._get_handle_rects(pixel_rect_f)
-                for handle_name, handle_rect_f_img_coords in handles.items():
-                    handle_rect_f_widget_coords = QRectF(to_widget_coords_from_pixels(handle_rect_f_img_coords.topLeft().toTuple()),
-                                                         to_widget_coords_from_pixels(handle_rect_f_img_coords.bottomRight().toTuple()))
+                pixel_rect_f = self._norm_to_pixel_rect(annotation, img_w, img_h)
+                for handle_name, handle_rect_f_img_coords in self._get_handle_rects(pixel_rect_f):
+                    handle_rect_f_widget_coords = QRectF(handle_rect_f_img_coords.x() * scale_x + offset_x,
+                                                         handle_rect_f_img_coords.y() * scale_y + offset_y,
+                                                         handle_rect_f_img_coords.width() * scale_x,
+                                                         handle_rect_f_img_coords.height() * scale_y)
                     painter.fillRect(handle_rect_f_widget_coords, SELECTED_COLOR) # Blue handles
-            else:
-                painter.setPen(QPen(UNSELECTED_COLOR, 2, Qt.SolidLine)) # Red for unselected
-                painter.drawRect(widget_rect_f)
-
-            # Determine bounding box color for text background
-            if annotation == self.selected_annotation:
+                painter.setPen(LABEL_TEXT_PEN)
                 bbox_color = SELECTED_COLOR
             else:
                 bbox_color = UNSELECTED_COLOR
 
             # Draw class ID
             class_id_text = str(annotation.class_id)
-            font = QFont("Sans-serif", 12)
-            font.setBold(True)
-            painter.setFont(font)
-            
-            text_rect = painter.fontMetrics().boundingRect(class_id_text)
+            text_size = label_sizes.get(class_id_text)
+            if text_size is None:
+                text_rect = label_metrics.boundingRect(class_id_text)
+                text_size = label_sizes[class_id_text] = (text_rect.width(), text_rect.height())
+            text_w, text_h = text_size
             text_x = widget_rect_f.x()
-            text_y = widget_rect_f.y() - text_rect.height() # Position directly on top edge
+            text_y = widget_rect_f.y() - text_h # Position directly on top edge
 
-            # Draw background rectangle for text
-            painter.fillRect(QRectF(text_x, text_y, text_rect.width(), text_rect.height()), bbox_color)
+            # Draw background rectangle for text, matching the box color
+            painter.fillRect(QRectF(text_x, text_y, text_w, text_h), bbox_color)
 
             # Draw text with a white color
-            painter.setPen(QPen(Qt.white, 1)) # Text color
-            painter.drawText(QPointF(text_x, text_y + painter.fontMetrics().ascent()), class_id_text)
+            painter.drawText(QPointF(text_x, text_y + label_ascent), class_id_text)
 
         if self.drawing:
-            p1 = to_widget_coords_from_pixels((self.start_point.x(), self.start_point.y()))
-            p2 = to_widget_coords_from_pixels((self.end_point.x(), self.end_point.y()))
+            p1 = QPointF(self.start_point.x() * scale_x + offset_x, self.start_point.y() * scale_y + offset_y)
+            p2 = QPointF(self.end_point.x() * scale_x + offset_x, self.end_point.y() * scale_y + offset_y)
             rect_f = QRectF(p1, p2)
-            painter.setPen(QPen(UNSELECTED_COLOR, 2, Qt.SolidLine))
+            painter.setPen(UNSELECTED_PEN)
             painter.drawRect(rect_f)
 
 class ImageView(QScrollArea):
@@ -445,8 +658,13 @@ class ImageView(QScrollArea):
     """
     annotation_added = Signal(object)
     annotation_changed = Signal(object) # New signal
+    # Emitted while a box is being dragged, at most once per move-update
+    # interval; annotation_changed follows once when the drag ends.
+    annotation_changing = Signal(object)
     annotation_deleted = Signal(object) # New signal
     annotation_selected_on_image = Signal(object) # New signal
+    # Path of the current image, emitted when it could not be loaded
+    image_load_failed = Signal(str)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -459,12 +677,155 @@ class ImageView(QScrollArea):
         self.tool = None
         self.current_image_path = None
         self.annotations = []
+        # One connection for the lifetime of the view, so saving or loading
+        # does not pay for opening the database each time.
+        self.conn = storage.create_connection("annotations.db")
+        # Annotation lists of recently viewed images, keyed by path, least
+        # recently used first. The lists are shared with self.annotations and
+        # edited in place, so they stay in sync without touching the database.
+        self._annotation_cache = OrderedDict()
+        # The default 10 MB QPixmapCache would not hold a single scaled photo
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), SCALED_PIXMAP_CACHE_KB))
+
+        # Images are decoded on a thread pool so switching images does not
+        # block the GUI. Decoded images, including prefetched neighbors, are
+        # kept in a small LRU cache keyed by path. An entry stays a QImage
+        # until its image is first shown, so neighbors the user never opens
+        # are never converted to a QPixmap on the GUI thread.
+        self._image_cache = OrderedDict()
+        self._image_loader = ImageLoader(self)
+        self._image_loader.image_loaded.connect(self._on_image_loaded)
+        self._image_loader.load_failed.connect(self._on_image_load_failed)
+
+        # Annotations are inserted, updated and deleted on a worker thread so
+        # the GUI does not wait on the database. Annotations discarded before
+        # their ID arrived are tracked by object identity.
+        self._discarded_saves = set()
+        self._writer_thread = QThread(self)
+        self._writer = AnnotationWriter("annotations.db")
+        self._writer.moveToThread(self._writer_thread)
+        self._writer.annotation_created.connect(self._on_annotation_created)
+        self._writer.write_failed.connect(self._on_annotation_write_failed)
+        self._writer.change_failed.connect(self._on_annotation_change_failed)
+        self._writer_thread.start()
+        # Make sure the thread is stopped even if the view is never closed explicitly
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close_connection)
         logger.info("Image view initialized.")
 
+    @Slot()
+    def close_connection(self):
+        """
+        Stop the writer thread and close the database connection held by the view.
+        """
+        self._image_loader.wait_for_done()
+        if self._writer_thread.isRunning():
+            # Queued behind every pending request, so all of them are written
+            # before the connection closes; quit() alone would drop them
+            QMetaObject.invokeMethod(self._writer, "close", Qt.BlockingQueuedConnection)
+            self._writer_thread.quit()
+            self._writer_thread.wait()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _remove_from_annotations(self, annotation):
+        """
+        Remove an annotation object from the current list, or from the cached
+        list of another image. Returns False if it is not there.
+        """
+        for annotations in (self.annotations, *self._annotation_cache.values()):
+            for index, current in enumerate(annotations):
+                if current is annotation:
+                    del annotations[index]
+                    return True
+        return False
+
+    def save_new_annotation(self, annotation):
+        """
+        Queue a new annotation for insertion on the writer thread.
+        """
+        values = (annotation.class_id, annotation.x1, annotation.y1, annotation.x2, annotation.y2)
+        self._writer.create_requested.emit(annotation, self.current_image_path, values)
+
+    def update_saved_annotation(self, annotation):
+        """
+        Queue a write of an annotation's current values on the writer thread.
+        """
+        values = (annotation.id, annotation.class_id, annotation.x1, annotation.y1, annotation.x2, annotation.y2)
+        self._writer.update_requested.emit(annotation, values)
+
+    def delete_saved_annotation(self, annotation):
+        """
+        Remove a saved annotation from the view and queue its deletion on the writer thread.
+        """
+        if self._remove_from_annotations(annotation):
+            self.annotation_deleted.emit(annotation)
+        self._writer.delete_requested.emit(annotation, annotation.id)
+        logger.info("Annotation ID %s deleted.", annotation.id)
+
+    def discard_pending_annotation(self, annotation):
+        """
+        Remove an annotation whose insert has not completed yet.
+        """
+        self._discarded_saves.add(id(annotation))
+        if self._remove_from_annotations(annotation):
+            self.annotation_deleted.emit(annotation)
+        # Queued behind the insert, so the writer deletes the row it creates
+        self._writer.delete_requested.emit(annotation, None)
+        logger.info("Unsaved annotation discarded.")
+
+    @Slot(object, object, object)
+    def _on_annotation_created(self, annotation, image_id, anno_id):
+        key = id(annotation)
+        if key in self._discarded_saves:
+            # Deleted while the insert was in flight; the writer already removed the row
+            self._discarded_saves.discard(key)
+            return
+
+        annotation.image_id = image_id
+        annotation.id = anno_id # Update with real ID
+        # Later requests carry the ID, so the writer can forget the annotation
+        self._writer.release_requested.emit(annotation)
+        logger.info("Annotation saved with ID: %s", anno_id)
+        self.annotation_changed.emit(annotation) # Update table with real ID
+
+    @Slot(object, str)
+    def _on_annotation_write_failed(self, annotation, message):
+        key = id(annotation)
+        if key in self._discarded_saves:
+            self._discarded_saves.discard(key)
+            return
+
+        QMessageBox.critical(self, "Error", f"Could not save the annotation: {message}")
+        # If saving fails, remove the temporary annotation
+        if self._remove_from_annotations(annotation):
+            self.annotation_deleted.emit(annotation)
+        if self.image_label.selected_annotation is annotation:
+            self.image_label.selected_annotation = None
+        self.image_label.update()
+
+    @Slot(object, str)
+    def _on_annotation_change_failed(self, annotation, message):
+        QMessageBox.critical(self, "Error", f"Could not save the annotation change: {message}")
+
     def set_tool(self, tool):
         self.tool = tool
-        self.image_label.selected_annotation = None # Deselect when changing tool
-        self.image_label.update()
+        self.image_label.setMouseTracking(tool == "select") # Drags still deliver moves without tracking
+        self.image_label._set_cursor_shape(None)
+        self.deselect_current() # Deselect when changing tool
+
+    def deselect_current(self):
+        """
+        Clear the selected annotation, if any, and tell listeners nothing is selected.
+        """
+        image_label = self.image_label
+        if image_label.selected_annotation is None:
+            return # Nothing to repaint or to clear in the table
+        image_label.selected_annotation = None
+        image_label.update()
+        self.annotation_selected_on_image.emit(None)
 
     def set_image(self, image_path):
         """
@@ -478,22 +839,73 @@ class ImageView(QScrollArea):
             return
 
         self.current_image_path = image_path
-        try:
-            self._pixmap = processing.load_image_as_pixmap(image_path)
-            if self._pixmap:
-                self.image_label.set_pixmap(self._pixmap)
-                logger.info(f"Image loaded: {image_path}")
-                self.load_annotations()
-            else:
-                self.image_label.setText(f"Could not load image: {image_path}")
-                logger.error(f"Failed to load image: {image_path}")
-                self.annotations = []
-        except Exception as e:
-            logger.error(f"Exception while loading image {image_path}: {e}")
-            QMessageBox.critical(self, "Error", f"Could not load the image: {e}")
-            self.annotations = []
+        image = self._image_cache.get(image_path)
+        if image is not None:
+            self._image_cache.move_to_end(image_path)
+            if isinstance(image, QImage):
+                image = QPixmap.fromImage(image) # Prefetched, shown for the first time
+                self._image_cache[image_path] = image
+            self._show_pixmap(image)
+        else:
+            # Annotations are shown as soon as the decoded image arrives
+            self._pixmap = None
+            self.image_label.set_pixmap(None)
+            self.image_label.setText("Loading image...")
+            self._image_loader.request(image_path)
+        self.load_annotations()
 
-        self.image_label.update()
+    def prefetch_images(self, image_paths):
+        """
+        Start decoding images that are likely to be opened next, e.g. the
+        neighbors in the image list, and load their annotations in one query.
+        """
+        for image_path in image_paths:
+            if image_path not in self._image_cache:
+                self._image_loader.request(image_path)
+        self.prefetch_annotations(image_paths)
+
+    def prefetch_annotations(self, image_paths):
+        """
+        Load the annotations of images that are not cached yet with a single
+        query and add them to the annotation cache.
+        """
+        missing = [path for path in image_paths if path not in self._annotation_cache]
+        if not missing or not self.conn:
+            return
+        annotations_by_path = storage.get_annotations_for_paths(self.conn, missing[-ANNOTATION_CACHE_SIZE:])
+        if annotations_by_path is None:
+            return # load_annotations queries them individually instead
+        for path, annotations in annotations_by_path.items():
+            self._annotation_cache[path] = annotations
+            if len(self._annotation_cache) > ANNOTATION_CACHE_SIZE:
+                self._annotation_cache.popitem(last=False)
+
+    def _show_pixmap(self, pixmap):
+        self._pixmap = pixmap
+        self.image_label.set_pixmap(pixmap)
+        logger.info("Image loaded: %s", self.current_image_path)
+
+    @Slot(str, object)
+    def _on_image_loaded(self, image_path, q_image):
+        if image_path == self.current_image_path and self._pixmap is None:
+            pixmap = QPixmap.fromImage(q_image)
+            self._image_cache[image_path] = pixmap
+            self._show_pixmap(pixmap)
+        else:
+            self._image_cache[image_path] = q_image # Converted if it is ever shown
+        if len(self._image_cache) > IMAGE_CACHE_SIZE:
+            self._image_cache.popitem(last=False)
+
+    @Slot(str, str)
+    def _on_image_load_failed(self, image_path, message):
+        logger.error(f"Failed to load image {image_path}: {message}")
+        if image_path == self.current_image_path:
+            # Nothing to annotate: drop the boxes set_image already loaded
+            self.annotations = []
+            self.image_label.selected_annotation = None
+            self.image_label.setText(f"Could not load image: {image_path}")
+            self.image_load_failed.emit(image_path)
+            QMessageBox.critical(self, "Error", f"Could not load the image: {message}")
 
     def load_annotations(self):
         """
@@ -501,13 +913,21 @@ class ImageView(QScrollArea):
         """
         self.annotations = []
         if self.current_image_path:
+            cached = self._annotation_cache.get(self.current_image_path)
+            if cached is not None:
+                self._annotation_cache.move_to_end(self.current_image_path)
+                self.annotations = cached
+                self.image_label.update()
+                return
             try:
-                conn = storage.create_connection("annotations.db")
+                conn = self.conn
                 if conn:
                     image_id = storage.get_image_id_by_path(conn, self.current_image_path)
                     if image_id:
                         self.annotations = storage.get_annotations_for_image(conn, image_id)
-                    conn.close()
+                    self._annotation_cache[self.current_image_path] = self.annotations
+                    if len(self._annotation_cache) > ANNOTATION_CACHE_SIZE:
+                        self._annotation_cache.popitem(last=False)
             except Exception as e:
                 logger.error(f"Error loading annotations: {e}")
                 QMessageBox.warning(self, "Warning", f"Could not load annotations: {e}")
@@ -519,11 +939,12 @@ class ImageView(QScrollArea):
         """
         super().resizeEvent(event)
 
+    @Slot(object)
     def select_annotation_from_table(self, annotation):
         """
         Select an annotation based on a selection from the table.
         """
         self.image_label.selected_annotation = annotation
         self.image_label.update()
-        logger.debug(f"Annotation ID {annotation.id} selected from table.")
+        logger.debug("Annotation ID %s selected from table.", annotation.id)
         self.annotation_selected_on_image.emit(annotation)
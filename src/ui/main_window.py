@@ -1,17 +1,19 @@
 """
 Main application window.
 """
-import os
 import logging
-from PySide6.QtWidgets import QMainWindow, QDockWidget, QFileDialog, QToolBar, QMessageBox
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QMainWindow, QDockWidget, QFileDialog, QToolBar, QMessageBox, QProgressDialog
+from PySide6.QtCore import Qt, Slot, QModelIndex, QTimer
 from PySide6.QtGui import QAction
 from .image_view import ImageView
 from .image_list_view import ImageListView
 from .annotation_view import AnnotationView
+from ..image.scanner import FolderScanner
 
 logger = logging.getLogger(__name__)
 
+SCAN_PROGRESS_DELAY_MS = 200 # Folder scans finishing sooner never show a progress dialog
+
 class MainWindow(QMainWindow):
     """
     Main window of the application.
@@ -22,6 +24,9 @@ class MainWindow(QMainWindow):
         self.showMaximized() # Maximize window by default
         self.current_folder = None
         self.current_tool = None
+        self._folder_dialog = None # Created on first use by _choose_folder
+        self._running_scan_id = None # ID of the folder scan still in progress
+        self._scan_progress = None
 
         # Central widget
         self.image_view = ImageView()
@@ -33,7 +38,13 @@ class MainWindow(QMainWindow):
         self.image_list_dock.setWidget(self.image_list_view)
         self.image_list_dock.setMinimumWidth(300)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.image_list_dock)
-        self.image_list_view.itemClicked.connect(self.on_image_clicked)
+        self.image_list_view.selectionModel().currentChanged.connect(self.on_current_image_changed)
+
+        # Background folder listing
+        self.folder_scanner = FolderScanner(self)
+        self.folder_scanner.chunk_ready.connect(self._on_scan_chunk)
+        self.folder_scanner.scan_finished.connect(self._on_scan_finished)
+        self.folder_scanner.scan_failed.connect(self._on_scan_failed)
 
         # Annotation View (Table)
         self.annotation_dock = QDockWidget("Annotations", self)
@@ -45,9 +56,11 @@ class MainWindow(QMainWindow):
         # Connect signals
         self.image_view.annotation_added.connect(self.on_annotation_added)
         self.image_view.annotation_changed.connect(self.annotation_view.update_annotation)
+        self.image_view.annotation_changing.connect(self.annotation_view.update_annotation) # Live table preview
         self.image_view.annotation_deleted.connect(self.annotation_view.remove_annotation)
         self.annotation_view.annotation_selected_from_table.connect(self.image_view.select_annotation_from_table)
         self.image_view.annotation_selected_on_image.connect(self.annotation_view.select_annotation_in_table)
+        self.image_view.image_load_failed.connect(self.on_image_load_failed)
 
         # Menu Bar
         self.menu_bar = self.menuBar()
@@ -73,58 +86,136 @@ class MainWindow(QMainWindow):
         
         logger.info("Main window initialized.")
 
+    def closeEvent(self, event):
+        self.folder_scanner.cancel() # A running scan is not waited for
+        self.image_view.close_connection()
+        super().closeEvent(event)
+
+    @Slot()
     def set_select_tool(self):
-        if self.select_tool_action.isChecked():
-            self.current_tool = "select"
-            self.draw_bbox_action.setChecked(False)
-            logger.info("Tool set to: Select")
-        else:
-            self.current_tool = None
-            logger.info("Tool unset.")
-        self.image_view.set_tool(self.current_tool)
-        # Explicitly deselect any annotation when changing tools
-        self.image_view.image_label.selected_annotation = None
-        self.image_view.image_label.update()
-        self.image_view.annotation_selected_on_image.emit(None) # Emit None to deselect in table
+        self._set_tool("select", self.select_tool_action, self.draw_bbox_action)
 
+    @Slot()
     def set_draw_bbox_tool(self):
-        if self.draw_bbox_action.isChecked():
-            self.current_tool = "bbox"
-            self.select_tool_action.setChecked(False)
-            logger.info("Tool set to: Draw BBox")
+        self._set_tool("bbox", self.draw_bbox_action, self.select_tool_action)
+
+    def _set_tool(self, name, action, other_action):
+        """
+        Apply a tool toggle. The tools are exclusive, so checking one unchecks the other.
+        """
+        if action.isChecked():
+            tool = name
+            other_action.setChecked(False)
+            logger.info("Tool set to: %s", action.text())
         else:
-            self.current_tool = None
+            tool = None
             logger.info("Tool unset.")
-        self.image_view.set_tool(self.current_tool)
-        # Explicitly deselect any annotation when changing tools
-        self.image_view.image_label.selected_annotation = None
-        self.image_view.image_label.update()
-        self.image_view.annotation_selected_on_image.emit(None) # Emit None to deselect in table
 
+        if tool != self.current_tool:
+            self.current_tool = tool
+            self.image_view.set_tool(tool)
+
+    def _choose_folder(self):
+        """
+        Ask the user for a folder. Returns its path, or None if the dialog was cancelled.
+        """
+        # Built once and reused, so later opens skip the dialog setup and
+        # start in the previously chosen directory
+        if self._folder_dialog is None:
+            self._folder_dialog = QFileDialog(self, "Open Folder")
+            self._folder_dialog.setFileMode(QFileDialog.Directory)
+            # Only a directory path is needed, so skip the per-entry icon and
+            # symlink lookups that make the dialog slow on network mounts
+            self._folder_dialog.setOptions(
+                QFileDialog.DontUseNativeDialog | QFileDialog.ShowDirsOnly
+                | QFileDialog.DontUseCustomDirectoryIcons | QFileDialog.DontResolveSymlinks
+            )
+        if self._folder_dialog.exec():
+            return self._folder_dialog.selectedFiles()[0]
+        return None
+
+    @Slot()
     def open_folder(self):
-        folder_path = QFileDialog.getExistingDirectory(self, "Open Folder")
+        folder_path = self._choose_folder()
         if folder_path:
-            try:
-                logger.info(f"Opening folder: {folder_path}")
-                self.current_folder = folder_path
-                self.image_list_view.clear()
-                self.annotation_view.clear_annotations()
-                self.image_view.set_image(None)
-                
-                image_files = [f for f in os.listdir(folder_path) if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
-                self.image_list_view.addItems(image_files)
-                logger.info(f"Found {len(image_files)} images in folder.")
-            except OSError as e:
-                logger.error(f"Error accessing folder {folder_path}: {e}")
-                QMessageBox.critical(self, "Error", f"Could not access the folder: {e}")
-
+            logger.info(f"Opening folder: {folder_path}")
+            self.current_folder = folder_path
+            self.image_list_view.clear()
+            self.annotation_view.clear_annotations()
+            self.image_view.set_image(None)
+            # The listing runs on a pool thread and arrives in chunks, so a
+            # large or slow (network) folder does not freeze the window
+            self._close_scan_progress()
+            scan_id = self._running_scan_id = self.folder_scanner.scan(folder_path)
+            QTimer.singleShot(SCAN_PROGRESS_DELAY_MS, lambda: self._show_scan_progress(scan_id))
+
+    def _show_scan_progress(self, scan_id):
+        """
+        Show a busy progress dialog for a scan that is still running.
+        """
+        if scan_id != self._running_scan_id or self._scan_progress is not None:
+            return # Finished, failed, cancelled or superseded in the meantime
+        self._scan_progress = QProgressDialog("Scanning folder...", "Cancel", 0, 0, self)
+        self._scan_progress.setWindowModality(Qt.WindowModal)
+        self._scan_progress.setMinimumDuration(0)
+        self._scan_progress.canceled.connect(self._cancel_scan)
+        self._scan_progress.show()
+
+    def _close_scan_progress(self):
+        if self._scan_progress is not None:
+            self._scan_progress.canceled.disconnect(self._cancel_scan)
+            self._scan_progress.close()
+            self._scan_progress.deleteLater()
+            self._scan_progress = None
+
+    @Slot()
+    def _cancel_scan(self):
+        self.folder_scanner.cancel()
+        self._running_scan_id = None
+        self._close_scan_progress()
+        logger.info(f"Folder scan cancelled after {self.image_list_view.count()} images.")
+
+    @Slot(int, list)
+    def _on_scan_chunk(self, scan_id, image_files):
+        if not self.folder_scanner.is_current(scan_id):
+            return # A newer folder was opened, or the scan was cancelled, meanwhile
+        # One row insertion per chunk; the model keeps only the names and paths
+        self.image_list_view.add_images(self.current_folder, image_files)
+        if self._scan_progress is not None:
+            self._scan_progress.setLabelText(f"Loaded {self.image_list_view.count()} images...")
+
+    @Slot(int, int)
+    def _on_scan_finished(self, scan_id, image_count):
+        if self.folder_scanner.is_current(scan_id):
+            self._running_scan_id = None
+            self._close_scan_progress()
+            logger.info(f"Found {image_count} images in folder.")
+
+    @Slot(int, str)
+    def _on_scan_failed(self, scan_id, message):
+        if self.folder_scanner.is_current(scan_id):
+            self._running_scan_id = None
+            self._close_scan_progress()
+            QMessageBox.critical(self, "Error", f"Could not access the folder: {message}")
+
+    @Slot(str)
+    def on_image_load_failed(self, image_path):
+        self.annotation_view.clear_annotations()
+
+    @Slot(object)
     def on_annotation_added(self, annotation):
-        logger.info(f"New annotation added with ID: {annotation.id}")
+        logger.info("New annotation added with ID: %s", annotation.id)
         self.annotation_view.add_annotation(annotation)
 
-    def on_image_clicked(self, item):
-        if self.current_folder:
-            image_path = os.path.join(self.current_folder, item.text())
-            logger.info(f"Image selected: {image_path}")
+    @Slot(QModelIndex, QModelIndex)
+    def on_current_image_changed(self, current, previous=None):
+        if current.isValid():
+            image_path = current.data(Qt.UserRole)
+            logger.info("Image selected: %s", image_path)
             self.image_view.set_image(image_path)
             self.annotation_view.load_annotations(self.image_view.annotations)
+
+            # Decode the neighbors in the background so stepping through the list is instant
+            row = current.row()
+            neighbors = [self.image_list_view.image_path(r) for r in (row + 1, row - 1)]
+            self.image_view.prefetch_images([path for path in neighbors if path is not None])
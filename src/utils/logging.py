@@ -1,16 +1,28 @@
 """
 Logging configuration.
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 
 def setup_logger():
     """
     Set up the root logger to output to the console.
+    Records are formatted and written by a background QueueListener, so
+    logging from the GUI thread only enqueues them. Returns the listener;
+    it is stopped, flushing pending records, at interpreter exit.
     """
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     handler = logging.StreamHandler(sys.stdout)
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener